@@ -1,81 +1,77 @@
-import csv
+import asyncio
 import os
+import shutil
+from collections import Counter
 from typing import List
-import requests
-import concurrent.futures
+import aiohttp
 from models.PDClient import PDClient
 from models.Report import PDFReport
 from utils.logger import logger
-from tqdm import tqdm
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import logging
-from requests.exceptions import SSLError
-import urllib3
+from tqdm.asyncio import tqdm
 import sys
 
 from utils.utils import append_to_csv
 
-urllib3_logger = logging.getLogger("urllib3")
-urllib3_logger.setLevel(logging.ERROR)
-
 
 class Downloader:
     """
     This class is responsible for downloading PDF reports from a list of URLs.
 
     Features:
-        - Handles downloading of PDF reports using concurrency.
+        - Handles downloading of PDF reports using asyncio with a bounded semaphore.
         - Supports retry logic for transient HTTP errors (e.g., 500, 502, 503, 504).
         - Logs HTTP status codes, exceptions, and the type of URL (primary or backup) to a CSV file.
         - Validates the content type of the downloaded files to ensure they are PDFs.
-        - Suppresses retry warnings from `urllib3` to keep logs clean.
+        - Routes all HTTP traffic through a single shared `aiohttp.ClientSession`.
 
     Arguments:
-        num_workers (int): The number of threads to use for downloading. Default is 5.
+        num_workers (int): The maximum number of concurrent downloads. Default is 5.
         log_file (str): The name of the CSV file to log status codes and exceptions. Default is "status_codes_count.csv".
 
     Attributes:
-        num_workers (int): The number of threads for concurrent downloads.
+        num_workers (int): The maximum number of concurrent downloads.
         pdclient (PDClient): An instance of PDClient to update the status of the downloaded reports.
         log_file (str): The name of the CSV file to log status codes and exceptions.
         download_folder (str): The folder where downloaded reports are saved.
         output_folder (str): The folder where output files (e.g., logs) are saved.
-        results (dict): A dictionary to track the count of HTTP status codes and exceptions.
-        session (requests.Session): A session with retry logic for HTTP requests.
+        log_path (str): The full path of the status count CSV file.
+        results (Counter): A counter tracking HTTP status codes and exceptions.
+        duplicates (dict): Reports sharing a URL with a scheduled report, keyed by its brnum.
     """
 
+    # Retry on these HTTP status codes
+    RETRY_STATUS_CODES = {500, 502, 503, 504}
+    MAX_RETRIES = 3
+
+    # Write the status count CSV every N results instead of on every download
+    FLUSH_INTERVAL = 500
+
+    # Stream response bodies in 64 KiB chunks to keep per-chunk overhead low
+    CHUNK_SIZE = 64 * 1024
+
+    # Separate connect and read budgets: a dead host fails after 3s instead
+    # of tying up a slot for the full read timeout
+    REQUEST_TIMEOUT = aiohttp.ClientTimeout(connect=3, sock_read=10)
+
     def __init__(self, num_workers=5, log_file="status_codes_count.csv"):
         self.num_workers = num_workers
         self.pdclient = PDClient()
         self.log_file = log_file
         self.download_folder = "downloads"
         self.output_folder = "output"
-        self.results = {}
+        self.log_path = os.path.join(self.output_folder, self.log_file)
+        self.results = Counter()
+        self.duplicates = {}
         self.successful_downloads = 0
         self.failed_downloads = 0
 
-        # Create a session with retry logic
-        self.session = requests.Session()
-
-        # Retry on 500, 502, 503, 504 status codes
-
-        retries = Retry(
-            total=3,  # Total number of retries
-            backoff_factor=1,  # Wait 1s, 2s, 4s, etc. between retries
-            # Retry on these HTTP status codes
-            status_forcelist=[500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retries)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-
-        # Suppress InsecureRequestWarning warnings
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
     def log_status_count(self, result: str | int) -> None:
         """
-        Logs the HTTP status code and updates the status code count in a CSV file.
+        Logs the HTTP status code and updates the status code count.
+
+        The counts are kept in memory and only flushed to the CSV file every
+        `FLUSH_INTERVAL` results (plus once at the end of `download`), so the
+        hot path doesn't rewrite the whole file per download.
 
         Arguments:
             status_code (int or str): The HTTP status code to log. If "N/A", it indicates an unknown error.
@@ -83,11 +79,17 @@ class Downloader:
         if not isinstance(result, str):
             result = int(result)
 
-        if result not in self.results:
-            self.results[result] = 1
+        self.results[result] += 1
+
+        if sum(self.results.values()) % self.FLUSH_INTERVAL == 0:
+            self.flush_status_counts()
 
-        else:
-            self.results[result] += 1
+    def flush_status_counts(self) -> None:
+        """
+        Writes the accumulated status code counts to the CSV file.
+        """
+        if not self.results:
+            return
 
         data = [
             {
@@ -97,12 +99,46 @@ class Downloader:
             for key, value in self.results.items()
         ]
 
-        append_to_csv(f"{self.output_folder}/{self.log_file}", data, 'w')
+        append_to_csv(self.log_path, data, 'w')
 
     def set_reports(self, pdf_reports: List[PDFReport]) -> None:
-        self.pdf_reports = pdf_reports
-
-        logger.info(f"Set {len(pdf_reports)} reports to download")
+        """
+        Sets the reports to download, skipping any that already exist on disk
+        so reruns don't re-download the whole corpus.
+        """
+        # One scandir up front instead of a per-report exists() stat; empty
+        # files don't count as downloaded
+        try:
+            existing = frozenset(entry.name for entry in os.scandir(self.download_folder)
+                                 if entry.stat().st_size > 0)
+        except FileNotFoundError:
+            existing = frozenset()
+
+        pending = [report for report in pdf_reports
+                   if f"{report.brnum}.pdf" not in existing]
+
+        skipped = len(pdf_reports) - len(pending)
+        if skipped:
+            logger.info("Skipping %d already downloaded reports", skipped)
+
+        # Schedule each unique URL once; reports sharing it get a hard link to
+        # the representative's file once it completes
+        seen_urls = {}
+        self.pdf_reports = []
+        for report in pending:
+            first = seen_urls.get(report.pdf_url)
+            if first is None:
+                seen_urls[report.pdf_url] = report
+                self.pdf_reports.append(report)
+            else:
+                self.duplicates.setdefault(first.brnum, []).append(report)
+
+        duplicate_count = len(pending) - len(self.pdf_reports)
+        if duplicate_count:
+            logger.info("Deduplicated %d reports sharing a URL with another report",
+                        duplicate_count)
+
+        logger.info("Set %d reports to download", len(self.pdf_reports))
 
     def handle_download_exception(self, report: PDFReport, exception: Exception, result: str) -> None:
         """
@@ -117,53 +153,136 @@ class Downloader:
         self.pdclient.update_status(report.brnum, False, result)
         self.failed_downloads += 1
 
-    def download_report(self, report: PDFReport, verify_ssl: bool = True) -> None:
+    def _replicate_duplicates(self, report: PDFReport, filename: str, status_code: int) -> None:
+        """
+        Hard-links a downloaded file to every report that shared its URL and
+        records them as downloaded. Falls back to copying on filesystems
+        without hard-link support.
+
+        Arguments:
+            report (PDFReport): The report whose download just completed.
+            filename (str): The path of the downloaded file.
+            status_code (int): The HTTP status code of the download.
+        """
+        for duplicate in self.duplicates.pop(report.brnum, []):
+            duplicate_filename = os.path.join(self.download_folder, f"{duplicate.brnum}.pdf")
+            try:
+                os.link(filename, duplicate_filename)
+            except OSError:
+                shutil.copyfile(filename, duplicate_filename)
+
+            self.pdclient.update_status(duplicate.brnum, True, status_code)
+            self.successful_downloads += 1
+
+    async def _probe_is_pdf(self, session: aiohttp.ClientSession, url: str) -> bool:
+        """
+        Probes a URL with a cheap HEAD request before committing to the GET.
+
+        Returns False only when the server definitively reports a non-PDF
+        content type; on errors, redirects gone wrong, or servers that don't
+        support HEAD the probe is inconclusive and the GET gets to decide.
+        """
+        try:
+            async with session.head(url, timeout=aiohttp.ClientTimeout(connect=3, total=5),
+                                    allow_redirects=True) as response:
+                if response.status != 200:
+                    return True
+
+                content_type = response.headers.get("Content-Type", "")
+                return content_type == "" or content_type.startswith("application/pdf")
+
+        except Exception:
+            return True
+
+    async def _download_report(self, session: aiohttp.ClientSession, report: PDFReport,
+                               sem: asyncio.Semaphore) -> None:
         """
         Downloads a single report with retry logic and exception handling.
 
         Arguments:
+            session (aiohttp.ClientSession): The shared HTTP session.
             report (PDFReport): The PDFReport object containing the report's URLs and metadata.
-            verify_ssl (bool): Whether to verify SSL certificates. Default is True.
+            sem (asyncio.Semaphore): Semaphore bounding the number of concurrent downloads.
         """
         urls_to_try = [report.pdf_url, report.backup_url] if report.backup_url else [report.pdf_url]
 
         for url in urls_to_try:
+            verify_ssl = True
             response = None  # Initialize response to None
             try:
-                # Use the session with retry logic
-                with self.session.get(url, timeout=10, stream=True, verify=verify_ssl) as response:
-                    response.raise_for_status()  # Raise an HTTPError for bad responses (4xx and 5xx)
-
-                    # Check if the response is a PDF
-                    if response.headers.get("Content-Type") != "application/pdf":
-                        raise ValueError(f"Unexpected Content-Type for {url}: {response.headers.get('Content-Type')}")
-
-                    # Save the file
-                    filename = os.path.join(self.download_folder, f"{report.brnum}.pdf")
-                    with open(filename, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8124):
-                            f.write(chunk)
-
-                    if os.path.exists(filename) and os.path.getsize(filename) > 0:
-                        self.pdclient.update_status(report.brnum, True, response.status_code)
-                        self.successful_downloads += 1
-                        return
-
-            except SSLError as e:
-                # Retry with SSL verification turned off
-                if verify_ssl:
-                    logger.warning(f"Retrying {url} with SSL verification disabled due to SSL error.")
-                    self.download_report(report, verify_ssl=False)
-                    return
-                else:
-                    self.handle_download_exception(report, e, "SSL Error")
-
-            except requests.HTTPError as e:
+                async with sem:
+                    # Skip the GET entirely when a HEAD already shows the body
+                    # isn't a PDF (typically an HTML error page)
+                    if not await self._probe_is_pdf(session, url):
+                        raise ValueError(f"Unexpected Content-Type for {url} (HEAD probe)")
+
+                    for attempt in range(self.MAX_RETRIES + 1):
+                        try:
+                            async with session.get(url, timeout=self.REQUEST_TIMEOUT,
+                                                   ssl=None if verify_ssl else False) as response:
+                                # Back off and retry on transient server errors
+                                if response.status in self.RETRY_STATUS_CODES and attempt < self.MAX_RETRIES:
+                                    await asyncio.sleep(2 ** attempt)
+                                    continue
+
+                                response.raise_for_status()  # Raise a ClientResponseError for bad responses (4xx and 5xx)
+
+                                # Check if the response is a PDF
+                                if response.headers.get("Content-Type") != "application/pdf":
+                                    raise ValueError(f"Unexpected Content-Type for {url}: {response.headers.get('Content-Type')}")
+
+                                # Save the file, tracking the bytes written so no
+                                # post-write stat calls are needed
+                                filename = os.path.join(self.download_folder, f"{report.brnum}.pdf")
+                                written = 0
+                                try:
+                                    with open(filename, "wb") as f:
+                                        async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                                            written += f.write(chunk)
+                                except Exception:
+                                    # Don't leave a truncated file behind if the stream dies mid-body
+                                    if os.path.exists(filename):
+                                        os.remove(filename)
+                                    raise
+
+                                if written > 0:
+                                    self.pdclient.update_status(report.brnum, True, response.status)
+                                    self.successful_downloads += 1
+                                    self._replicate_duplicates(report, filename, response.status)
+                                    return
+
+                                # A zero-byte body isn't a usable PDF; remove the
+                                # empty file so it can't mask the report on reruns
+                                os.remove(filename)
+
+                        except aiohttp.ClientSSLError:
+                            # Turn SSL verification off once and stay in the retry
+                            # loop, so the attempt budget stays bounded
+                            if verify_ssl and attempt < self.MAX_RETRIES:
+                                logger.warning("Retrying %s with SSL verification disabled due to SSL error.", url)
+                                verify_ssl = False
+                                continue
+                            raise
+
+                        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                            # Transient connect/read failures (resets, timeouts) get
+                            # the same backoff the urllib3 Retry used to give them.
+                            # SSL errors never land here: the clause above catches
+                            # them first.
+                            if attempt < self.MAX_RETRIES:
+                                await asyncio.sleep(2 ** attempt)
+                                continue
+                            raise
+
+            except aiohttp.ClientSSLError as e:
+                self.handle_download_exception(report, e, "SSL Error")
+
+            except aiohttp.ClientResponseError as e:
                 # Check if response exists and handle accordingly
                 if response is None:
                     status_code = "N/A"
                 else:
-                    status_code = response.status_code
+                    status_code = response.status
 
                 self.handle_download_exception(report, e, status_code)
 
@@ -174,28 +293,52 @@ class Downloader:
                 exception_type = type(e).__name__
                 self.handle_download_exception(report, e, exception_type)
 
+        # Reports sharing this URL inherit the failure so the status CSV stays complete
+        for duplicate in self.duplicates.pop(report.brnum, []):
+            self.pdclient.update_status(duplicate.brnum, False, "Duplicate URL failed")
+            self.failed_downloads += 1
+
+    async def _run_all(self) -> None:
+        """
+        Downloads all the reports concurrently on the event loop.
+
+        A single `aiohttp.ClientSession` is shared across all downloads, a semaphore
+        bounds the number of in-flight requests, and progress is displayed using
+        the `tqdm` progress bar.
+        """
+        sem = asyncio.Semaphore(self.num_workers)
+
+        # Size the connection pool to match the worker count so sockets are
+        # reused (keep-alive) instead of being discarded and reopened, and cap
+        # the number of connections per host to stay polite.
+        connector = aiohttp.TCPConnector(
+            limit=self.num_workers, limit_per_host=20, keepalive_timeout=30)
+
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [asyncio.ensure_future(self._download_report(session, report, sem))
+                     for report in self.pdf_reports]
+
+            # tqdm advances in completion order, so one slow host can't stall the bar
+            for task in tqdm.as_completed(tasks, desc="Downloading PDFs", unit="pdf", file=sys.stderr):
+                try:
+                    # Wait for the task to complete
+                    await task
+
+                except Exception as e:
+                    # Lazy %s formatting: the exception is only stringified
+                    # when the record is actually emitted
+                    logger.error("Failed to download report because %s", e)
+
     def download(self) -> None:
         """
-        Downloads all the reports using a thread pool for concurrency.
-
-        This method uses the `concurrent.futures.ThreadPoolExecutor` to download multiple reports
-        simultaneously. Progress is displayed using the `tqdm` progress bar.
-        """
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.num_workers) as executor:
-            futures = [executor.submit(self.download_report, report)
-                       for report in self.pdf_reports]
-
-            # Create a single tqdm progress bar with a custom description
-            with tqdm(total=len(futures), desc="Downloading PDFs", unit="pdf", file=sys.stderr) as progress_bar:
-                for future in concurrent.futures.as_completed(futures):
-                    try:
-                        # Wait for the future to complete
-                        future.result()
-                    
-                    except Exception as e:
-                        logger.error(f"Failed to download report because {e}")
-                    finally:
-                        # Update the progress bar after each task completes
-                        progress_bar.update(1)
-
-        logger.info(f"Sucessful downloads: {self.successful_downloads} | Failed downloads: {self.failed_downloads}")
\ No newline at end of file
+        Downloads all the reports using asyncio for concurrency.
+
+        This method runs `_run_all` on a fresh event loop so callers don't need
+        to be async themselves.
+        """
+        asyncio.run(self._run_all())
+        self.flush_status_counts()
+        self.pdclient.flush_status()
+
+        logger.info("Sucessful downloads: %d | Failed downloads: %d",
+                    self.successful_downloads, self.failed_downloads)
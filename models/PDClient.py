@@ -31,43 +31,75 @@ class PDClient:
 
     Methods:
         parse_excel_to_reports(): Parses the Excel file and returns a list of `PDFReport` objects.
-        update_status(brnum, downloaded, status_code): Updates the download status of a report and logs it to a CSV file.
+        update_status(brnum, downloaded, status_code): Buffers the download status of a report.
+        flush_status(): Appends the buffered status rows to the CSV file.
     """
+
+    # Append buffered status rows to the CSV every N updates instead of
+    # opening the file once per download
+    FLUSH_INTERVAL = 500
+
     def __init__(self, file_name="GRI_2017_2020", folder_path="data"):
         self.file_name = file_name
         self.folder_path = folder_path
         self.csv_file = "downloaded_reports.csv"
         self.output_folder = "output"
+        self.status_buffer = []
         self.id = "BRnum"
+
+        # Only load the columns we use and pin them to str, so pandas doesn't
+        # spend the load phase inferring dtypes for columns we throw away
         self.df = pd.read_excel(
-            f"{self.folder_path}/{self.file_name}.xlsx", index_col=self.id)
+            f"{self.folder_path}/{self.file_name}.xlsx",
+            index_col=self.id,
+            usecols=[self.id, "Pdf_URL", "Report Html Address"],
+            dtype=str)
 
     def parse_excel_to_reports(self) -> List[PDFReport]:
         reports = []
-        df = self.df
 
-        for i in df.index:
+        # itertuples iterates the columns in C instead of going through the
+        # pandas indexing machinery three times per row with df.at
+        urls = self.df[["Pdf_URL", "Report Html Address"]]
+
+        # Map missing URLs to None in one vectorized pass, so PDFReport
+        # doesn't need to string-match "nan" on every row
+        rows = urls.where(urls.notna(), None).itertuples(index=True, name=None)
+
+        skipped = 0
+        for brnum, pdf_url, backup_url in rows:
             try:
-                report = PDFReport(
-                    i, df.at[i, "Pdf_URL"], df.at[i, "Report Html Address"])
-                reports.append(report)
-            
-            except Exception as e:
+                reports.append(PDFReport(brnum, pdf_url, backup_url))
+
+            except Exception:
+                skipped += 1
                 continue
 
-        logger.info(
-            f"Succesfully parsed all reports from {self.file_name}.xlsx")
+        # One aggregate message instead of logging every unparsable row
+        logger.info("Succesfully parsed %d reports from %s.xlsx (%d rows skipped)",
+                    len(reports), self.file_name, skipped)
         return reports
 
     def update_status(self, brnum, downloaded, status_code) -> None:
         # Convert the boolean `downloaded` to "Yes" or "No"
         status = "Yes" if downloaded else "No"
 
-        # Append the ReportStatus object to the CSV
-        
-        dict = {
+        # Buffer the status row; it is written out by flush_status
+        self.status_buffer.append({
             "BRnum": brnum,
             "Downloaded": status,
             "Status Code": status_code
-        }
-        append_to_csv(f"{self.output_folder}/{self.csv_file}", dict)
+        })
+
+        if len(self.status_buffer) >= self.FLUSH_INTERVAL:
+            self.flush_status()
+
+    def flush_status(self) -> None:
+        """
+        Appends the buffered status rows to the CSV file in a single write.
+        """
+        if not self.status_buffer:
+            return
+
+        append_to_csv(f"{self.output_folder}/{self.csv_file}", self.status_buffer)
+        self.status_buffer.clear()
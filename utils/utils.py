@@ -2,49 +2,55 @@ import os
 import csv
 from typing import Dict, List, Union
 
+def _write_csv_rows(f, data: Union[Dict, List[Dict]], write_headers: bool) -> None:
+    """
+    Writes the headers (if requested) and data rows to an open CSV file.
+    """
+    writer = csv.writer(f)
+
+    # Write the headers if needed
+    if write_headers:
+        if isinstance(data, list) and len(data) > 0:
+            writer.writerow(data[0].keys())  # Use keys from the first dictionary as headers
+        elif isinstance(data, dict):
+            writer.writerow(data.keys())  # Use dictionary keys as headers
+
+    # Write the data rows
+    if isinstance(data, list):
+        writer.writerows(row.values() for row in data)  # One buffered call for all rows
+    elif isinstance(data, dict):
+        writer.writerow(data.values())  # Write the single dictionary's values as a row
+    else:
+        raise ValueError("Data must be a dictionary or a list of dictionaries.")
+
+
 def append_to_csv(file_path: str, data: Union[Dict, List[Dict]], mode='a') -> None:
     """
     Appends data to a CSV file. If the file is empty or in 'w' mode, it writes the headers.
+    In 'w' mode the file is replaced atomically, so readers never see a half-written file.
 
     Args:
         file_path (str): Path to the CSV file.
         data (Union[Dict, List[Dict]]): Data to append. Can be a single dictionary or a list of dictionaries.
         mode (str): File mode ('a' for append, 'w' for overwrite). Default is 'a'.
     """
-    # Determine if headers need to be written
-    write_headers = False
     if mode == 'w':
-        # In 'w' mode, always write headers because the file is being overwritten
+        # Write to a temp file and swap it in, always with headers
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, 'w', newline='') as f:
+            _write_csv_rows(f, data, write_headers=True)
+        os.replace(tmp_path, file_path)
+        return
+
+    # In 'a' mode, write headers when the file is missing or empty;
+    # a single stat is cheaper than opening the file and reading a line
+    try:
+        write_headers = os.path.getsize(file_path) == 0
+    except OSError:
         write_headers = True
-    else:
-        # In 'a' mode, check if the file is empty
-        try:
-            with open(file_path, 'r') as f:
-                write_headers = f.readline().strip() == ""
-        except FileNotFoundError:
-            # If the file doesn't exist, treat it as empty
-            write_headers = True
-
-    # Open the file in the specified mode
+
     with open(file_path, mode, newline='') as f:
-        writer = csv.writer(f)
-
-        # Write the headers if needed
-        if write_headers:
-            if isinstance(data, list) and len(data) > 0:
-                writer.writerow(data[0].keys())  # Use keys from the first dictionary as headers
-            elif isinstance(data, dict):
-                writer.writerow(data.keys())  # Use dictionary keys as headers
-
-        # Write the data rows
-        if isinstance(data, list):
-            for row in data:
-                writer.writerow(row.values())  # Write each dictionary's values as a row
-        elif isinstance(data, dict):
-            writer.writerow(data.values())  # Write the single dictionary's values as a row
-        else:
-            raise ValueError("Data must be a dictionary or a list of dictionaries.")
+        _write_csv_rows(f, data, write_headers)
         
 def create_folder_if_not_exists(folder_name: str) -> None:
-    if not os.path.exists(folder_name):
-        os.makedirs(folder_name)
\ No newline at end of file
+    os.makedirs(folder_name, exist_ok=True)
\ No newline at end of file